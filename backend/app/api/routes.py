@@ -2,21 +2,44 @@
 API routes for Bursa Stock Tracker.
 Provides REST API endpoints for frontend connectivity.
 """
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict
+from fastapi import APIRouter, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from typing import List, Dict, Optional
+from datetime import datetime
 from pydantic import BaseModel
 
 from app.core.config import config
 from app.services.stock_monitor import (
     get_all_stock_prices,
+    get_last_price,
     get_price_history,
     get_stock_price,
-    load_last_alerts
+    get_last_alerts,
+    refresh_threshold_arrays
 )
-from app.utils.helpers import validate_stock_symbol
+from app.utils.helpers import TIMESTAMP_FORMAT, json_dumps, validate_stock_symbol
 
 router = APIRouter(prefix="/api", tags=["stocks"])
 
+# Serialized /thresholds response, rebuilt whenever thresholds change
+_THRESHOLDS_CACHE: bytes = b""
+
+
+def _rebuild_thresholds_cache() -> None:
+    """Serialize the current thresholds for the /thresholds endpoint."""
+    global _THRESHOLDS_CACHE
+    _THRESHOLDS_CACHE = json_dumps({"thresholds": config.thresholds})
+
+
+_rebuild_thresholds_cache()
+
+
+def _thresholds_changed() -> None:
+    """Refresh all derived threshold state after config.thresholds is mutated."""
+    config.refresh_thresholds_flat()
+    refresh_threshold_arrays()
+    _rebuild_thresholds_cache()
+
 
 class StockThreshold(BaseModel):
     """Stock threshold model for API requests."""
@@ -28,6 +51,7 @@ class StockInfo(BaseModel):
     """Stock information response model."""
     symbol: str
     current_price: float
+    price_updated_at: Optional[str]
     threshold_up: float
     threshold_down: float
 
@@ -51,9 +75,12 @@ async def get_stocks():
         stocks = []
         
         for symbol, thresholds in config.thresholds.items():
+            # Stocks not fetched yet report 0.0 with no update time
+            price, updated_at = prices.get(symbol, (0.0, None))
             stock_info = {
                 "symbol": symbol,
-                "current_price": prices.get(symbol, 0.0),
+                "current_price": price,
+                "price_updated_at": updated_at,
                 "threshold_up": thresholds['up'],
                 "threshold_down": thresholds['down']
             }
@@ -82,12 +109,19 @@ async def get_stock(symbol: str):
         raise HTTPException(status_code=404, detail="Stock not found in monitored list")
     
     try:
-        price = get_stock_price(symbol)
+        # Prefer the monitor's snapshot; fetch off the event loop only if missing
+        last = get_last_price(symbol)
+        if last is None:
+            price = await run_in_threadpool(get_stock_price, symbol)
+            updated_at = datetime.now().strftime(TIMESTAMP_FORMAT)
+        else:
+            price, updated_at = last
         thresholds = config.thresholds[symbol]
         
         return {
             "symbol": symbol,
             "current_price": price,
+            "price_updated_at": updated_at,
             "threshold_up": thresholds['up'],
             "threshold_down": thresholds['down']
         }
@@ -122,7 +156,7 @@ async def get_alerts():
         Dictionary of last alert times per stock
     """
     try:
-        alerts = load_last_alerts()
+        alerts = get_last_alerts()
         return {"alerts": alerts}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching alerts: {str(e)}")
@@ -136,7 +170,42 @@ async def get_thresholds():
     Returns:
         Dictionary of stock thresholds
     """
-    return {"thresholds": config.thresholds}
+    return Response(content=_THRESHOLDS_CACHE, media_type="application/json")
+
+
+@router.put("/thresholds")
+async def update_thresholds(thresholds: Dict[str, StockThreshold]):
+    """
+    Update many stock thresholds in one request (in-memory only, not persisted to file).
+    
+    Either all thresholds are applied or, if any entry is invalid, none are.
+    
+    Args:
+        thresholds: Mapping of stock symbol to new threshold values
+    
+    Returns:
+        Number of updated thresholds
+    """
+    for symbol, threshold in thresholds.items():
+        if not validate_stock_symbol(symbol):
+            raise HTTPException(status_code=400, detail=f"Invalid stock symbol format: {symbol}")
+        if threshold.up <= threshold.down or threshold.down <= 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid threshold values for {symbol}: up must be > down > 0"
+            )
+    
+    # Update in-memory config (Note: This won't persist to thresholds.json)
+    config.thresholds.update({
+        symbol: {"up": threshold.up, "down": threshold.down}
+        for symbol, threshold in thresholds.items()
+    })
+    _thresholds_changed()
+    
+    return {
+        "updated": len(thresholds),
+        "message": "Thresholds updated (in-memory only)"
+    }
 
 
 @router.put("/thresholds/{symbol}")
@@ -159,6 +228,7 @@ async def update_threshold(symbol: str, threshold: StockThreshold):
     
     # Update in-memory config (Note: This won't persist to thresholds.json)
     config.thresholds[symbol] = {"up": threshold.up, "down": threshold.down}
+    _thresholds_changed()
     
     return {
         "symbol": symbol,
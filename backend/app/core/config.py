@@ -4,10 +4,15 @@ Loads settings from environment variables (.env file).
 """
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List, Tuple
 from pathlib import Path
 from dotenv import load_dotenv
 
+from app.core.logger import setup_logger
+from app.utils.helpers import json_loads, validate_stock_symbol, validate_threshold
+
+logger = setup_logger()
+
 # Get the backend directory path
 BACKEND_DIR = Path(__file__).parent.parent.parent
 ENV_PATH = BACKEND_DIR / '.env'
@@ -24,6 +29,8 @@ class Config:
         self.telegram = self._load_telegram_config()
         self.monitor = self._load_monitor_config()
         self.thresholds = self._load_thresholds()
+        self.thresholds_flat: List[Tuple[str, float, float]] = []
+        self.refresh_thresholds_flat()
     
     def _load_email_config(self) -> Dict[str, Any]:
         """Load email configuration from environment variables."""
@@ -53,8 +60,8 @@ class Config:
         """Load stock thresholds from thresholds.json."""
         thresholds_path = BACKEND_DIR / 'thresholds.json'
         try:
-            with open(thresholds_path, 'r') as f:
-                return json.load(f)
+            with open(thresholds_path, 'rb') as f:
+                return json_loads(f.read())
         except FileNotFoundError:
             raise FileNotFoundError(
                 f"thresholds.json not found at {thresholds_path}. Please create it with stock thresholds."
@@ -62,6 +69,25 @@ class Config:
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in thresholds.json: {e}")
     
+    def refresh_thresholds_flat(self) -> None:
+        """
+        Rebuild thresholds_flat, a list of (symbol, up, down) tuples for hot loops.
+        
+        Must be called whenever self.thresholds changes. Entries with an invalid
+        symbol or threshold are logged once here and left out, so hot loops
+        need no per-cycle validation.
+        """
+        flat = []
+        for symbol, limits in self.thresholds.items():
+            if not validate_stock_symbol(symbol):
+                logger.warning(f"Invalid stock symbol: {symbol}")
+                continue
+            if not validate_threshold(limits):
+                logger.warning(f"Invalid threshold for {symbol}: {limits}")
+                continue
+            flat.append((symbol, float(limits['up']), float(limits['down'])))
+        self.thresholds_flat = flat
+    
     def validate(self) -> None:
         """Validate that all required configuration is present."""
         errors = []
@@ -6,12 +6,11 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import asyncio
-import schedule
-import time
 
 from app.api.routes import router
 from app.core.config import config
 from app.core.logger import setup_logger
+from app.services.notifications import close_email_connection
 from app.services.stock_monitor import check_stocks
 
 logger = setup_logger()
@@ -21,23 +20,33 @@ monitoring_task = None
 should_monitor = True
 
 
+async def _run_check(loop):
+    """Run one monitoring cycle in a worker thread, logging any failure."""
+    try:
+        await loop.run_in_executor(None, check_stocks)
+    except Exception as e:
+        logger.error(f"Error during stock check: {e}")
+
+
 async def run_monitoring():
     """Background task to run stock monitoring."""
-    global should_monitor
-    
-    # Schedule periodic checks
     interval = config.monitor['check_interval_minutes']
-    schedule.every(interval).minutes.do(check_stocks)
+    sleep_seconds = interval * 60
+    loop = asyncio.get_running_loop()
+    next_run = loop.time()
     
-    # Initial check
-    check_stocks()
+    # Initial check (runs in a worker thread to keep the event loop free)
+    await _run_check(loop)
     
     logger.info(f"Stock monitoring started (interval: {interval} minutes)")
     
-    # Run scheduled tasks
+    # Run periodic checks on a fixed schedule, sleeping until the next slot
+    # so the time a check takes does not push later checks back
     while should_monitor:
-        schedule.run_pending()
-        await asyncio.sleep(1)
+        next_run = max(next_run + sleep_seconds, loop.time())
+        await asyncio.sleep(next_run - loop.time())
+        if should_monitor:
+            await _run_check(loop)
 
 
 @asynccontextmanager
@@ -71,6 +80,8 @@ async def lifespan(app: FastAPI):
             await monitoring_task
         except asyncio.CancelledError:
             pass
+    # Off the event loop: a still-running check may hold the sender's lock
+    await asyncio.get_running_loop().run_in_executor(None, close_email_connection)
     logger.info("Bursa Stock Tracker API stopped")
 
 
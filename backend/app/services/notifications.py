@@ -2,24 +2,151 @@
 Notification services for Bursa Stock Tracker.
 Handles email and Telegram notifications.
 """
+import random
 import smtplib
+import threading
 import time
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 
 from app.core.config import config
 from app.core.logger import setup_logger
-from app.utils.helpers import format_price
+from app.utils.helpers import TIMESTAMP_FORMAT, format_price
 
 logger = setup_logger()
 
+# Telegram rejects messages over 4096 characters
+TELEGRAM_MAX_MESSAGE_LENGTH = 4000
+
+# Static parts of the alert email
+_EMAIL_HEADER = (
+    "<h2 style='color:#2E86C1;'>Bursa Stock Alerts</h2>"
+    "<table border='1' cellpadding='5' cellspacing='0' style='border-collapse: collapse;'>"
+    "<tr style='background-color:#f0f0f0;'><th>Stock</th><th>Price</th><th>Alert</th><th>Threshold</th></tr>"
+)
+_EMAIL_FOOTER = "</table><p style='color:#666; font-size:12px;'>Generated at {generated_at}</p>"
+
+# Reused HTTPS connection to the Telegram Bot API
+_TG_BASE = f"https://api.telegram.org/bot{config.telegram['bot_token']}/sendMessage"
+_TG_SESSION = requests.Session()
+_TG_SESSION.mount('https://', HTTPAdapter(pool_connections=1, pool_maxsize=4, max_retries=0))
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Capped exponential backoff with jitter to avoid retrying in lockstep."""
+    return min(2 ** attempt, 4) + random.uniform(0, 0.5)
+
+
+class EmailSender:
+    """
+    Send emails over one SMTP connection kept open for the whole process.
+    
+    The connection is opened on the first send and checked with NOOP
+    before each later send; if the server has dropped it, it is reopened.
+    Every socket operation is bounded by timeout. Sends are serialized
+    with a lock.
+    """
+    
+    max_retries = 3
+    timeout = 30  # Seconds; bounds every blocking socket operation
+    
+    def __init__(self):
+        self._server: Optional[smtplib.SMTP] = None
+        self._lock = threading.Lock()
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection."""
+        email_conf = config.email
+        server = smtplib.SMTP(email_conf['smtp_server'], email_conf['smtp_port'], timeout=self.timeout)
+        try:
+            server.starttls()
+            server.login(email_conf['email_address'], email_conf['password'])
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+        return server
+    
+    def _get_server(self) -> smtplib.SMTP:
+        """Return the open connection, reconnecting if the server dropped it."""
+        if self._server is not None:
+            try:
+                if self._server.noop()[0] == 250:
+                    return self._server
+            except (smtplib.SMTPServerDisconnected, OSError):
+                pass
+            logger.info("SMTP connection lost, reconnecting")
+            self._close()
+        return self._connect()
+    
+    def _close(self) -> None:
+        """Close the SMTP connection if open."""
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+    
+    def close(self) -> None:
+        """Close the SMTP connection (e.g. on shutdown)."""
+        with self._lock:
+            self._close()
+    
+    def send(self, subject: str, html_content: str) -> bool:
+        """
+        Send email notification.
+        
+        Args:
+            subject: Email subject
+            html_content: HTML email body
+        
+        Returns:
+            True if successful, False otherwise
+        """
+        email_conf = config.email
+        msg = MIMEMultipart()
+        msg['From'] = email_conf['email_address']
+        msg['To'] = email_conf['email_address']
+        msg['Subject'] = subject
+        msg.attach(MIMEText(html_content, 'html'))
+        
+        with self._lock:
+            for attempt in range(self.max_retries):
+                try:
+                    self._get_server().send_message(msg)
+                    logger.info(f"Email sent successfully: {subject}")
+                    return True
+                except Exception as e:
+                    logger.warning(f"Email send attempt {attempt + 1}/{self.max_retries} failed: {e}")
+                    if isinstance(e, (smtplib.SMTPServerDisconnected, OSError)):
+                        # Connection is unusable; the next attempt reconnects
+                        self._close()
+                    if attempt < self.max_retries - 1:
+                        time.sleep(_backoff_delay(attempt))
+                    else:
+                        logger.error(f"Failed to send email after {self.max_retries} attempts")
+                        return False
+
+
+# Process-wide sender shared by all notification cycles
+_EMAIL_SENDER = EmailSender()
+
+
+def close_email_connection() -> None:
+    """Close the shared SMTP connection."""
+    _EMAIL_SENDER.close()
+
 
 def send_email(subject: str, html_content: str) -> bool:
     """
-    Send email notification.
+    Send email notification via the shared EmailSender.
     
     Args:
         subject: Email subject
@@ -28,30 +155,7 @@ def send_email(subject: str, html_content: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    email_conf = config.email
-    msg = MIMEMultipart()
-    msg['From'] = email_conf['email_address']
-    msg['To'] = email_conf['email_address']
-    msg['Subject'] = subject
-    msg.attach(MIMEText(html_content, 'html'))
-
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            server = smtplib.SMTP(email_conf['smtp_server'], email_conf['smtp_port'])
-            server.starttls()
-            server.login(email_conf['email_address'], email_conf['password'])
-            server.send_message(msg)
-            server.quit()
-            logger.info(f"Email sent successfully: {subject}")
-            return True
-        except Exception as e:
-            logger.warning(f"Email send attempt {attempt + 1}/{max_retries} failed: {e}")
-            if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
-            else:
-                logger.error(f"Failed to send email after {max_retries} attempts")
-                return False
+    return _EMAIL_SENDER.send(subject, html_content)
 
 
 def send_telegram(message: str) -> bool:
@@ -64,53 +168,84 @@ def send_telegram(message: str) -> bool:
     Returns:
         True if successful, False otherwise
     """
-    telegram_conf = config.telegram
-    url = f"https://api.telegram.org/bot{telegram_conf['bot_token']}/sendMessage"
-    payload = {'chat_id': telegram_conf['chat_id'], 'text': message}
+    payload = {'chat_id': config.telegram['chat_id'], 'text': message}
     
     max_retries = 3
     for attempt in range(max_retries):
         try:
-            response = requests.post(url, data=payload, timeout=10)
+            response = _TG_SESSION.post(_TG_BASE, data=payload, timeout=10)
             response.raise_for_status()
             logger.info(f"Telegram message sent: {message[:50]}...")
             return True
         except Exception as e:
             logger.warning(f"Telegram send attempt {attempt + 1}/{max_retries} failed: {e}")
             if attempt < max_retries - 1:
-                time.sleep(2 ** attempt)  # Exponential backoff
+                time.sleep(_backoff_delay(attempt))
             else:
                 logger.error(f"Failed to send Telegram message after {max_retries} attempts")
                 return False
 
 
+def build_telegram_messages(triggered_alerts: List[Dict]) -> List[str]:
+    """
+    Build Telegram messages for triggered alerts.
+    
+    All alerts go into one message, split only where it would exceed
+    Telegram's message length limit.
+    
+    Args:
+        triggered_alerts: List of alert dictionaries
+    
+    Returns:
+        List of message texts
+    """
+    lines = [
+        f"🚨 {alert['stock']} {alert['alert_type']} — RM{format_price(alert['price'])} "
+        f"(thr RM{format_price(alert['threshold'])})"
+        for alert in triggered_alerts
+    ]
+    messages: List[str] = []
+    chunk: List[str] = []
+    chunk_length = 0
+    for line in lines:
+        if chunk and chunk_length + len(line) + 1 > TELEGRAM_MAX_MESSAGE_LENGTH:
+            messages.append("\n".join(chunk))
+            chunk, chunk_length = [], 0
+        chunk.append(line)
+        chunk_length += len(line) + 1
+    if chunk:
+        messages.append("\n".join(chunk))
+    return messages
+
+
 def send_notifications(triggered_alerts: List[Dict]) -> None:
     """
     Send email and Telegram notifications for triggered alerts.
     
+    The email and Telegram messages are sent concurrently. The email goes
+    over the process-wide SMTP connection, so a cycle's alerts do not pay
+    for a new SMTP handshake.
+    
     Args:
         triggered_alerts: List of alert dictionaries
     """
     # Build HTML email
-    html = "<h2 style='color:#2E86C1;'>Bursa Stock Alerts</h2>"
-    html += "<table border='1' cellpadding='5' cellspacing='0' style='border-collapse: collapse;'>"
-    html += "<tr style='background-color:#f0f0f0;'><th>Stock</th><th>Price</th><th>Alert</th><th>Threshold</th></tr>"
+    parts: List[str] = [_EMAIL_HEADER]
     
     for alert in triggered_alerts:
         color = "green" if alert['alert_type'] == "UP" else "red"
-        html += f"<tr><td>{alert['stock']}</td><td>{format_price(alert['price'])}</td>"
-        html += f"<td style='color:{color}; font-weight:bold;'>{alert['alert_type']}</td>"
-        html += f"<td>{format_price(alert['threshold'])}</td></tr>"
+        parts.append(
+            f"<tr><td>{alert['stock']}</td><td>{format_price(alert['price'])}</td>"
+            f"<td style='color:{color}; font-weight:bold;'>{alert['alert_type']}</td>"
+            f"<td>{format_price(alert['threshold'])}</td></tr>"
+        )
     
-    html += "</table>"
-    html += f"<p style='color:#666; font-size:12px;'>Generated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>"
-
-    # Send email
-    send_email("Bursa Stock Alerts", html)
+    parts.append(_EMAIL_FOOTER.format(generated_at=datetime.now().strftime(TIMESTAMP_FORMAT)))
+    html = "".join(parts)
 
-    # Send Telegram messages
-    for alert in triggered_alerts:
-        message = (f"🚨 {alert['stock']} {alert['alert_type']} Alert!\\n"
-                  f"Current: RM {format_price(alert['price'])}\\n"
-                  f"Threshold: RM {format_price(alert['threshold'])}")
-        send_telegram(message)
+    # Send email in the background while Telegram messages go out
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        email_future = executor.submit(send_email, "Bursa Stock Alerts", html)
+        for message in build_telegram_messages(triggered_alerts):
+            send_telegram(message)
+        email_future.result()
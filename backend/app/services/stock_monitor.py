@@ -2,16 +2,20 @@
 Stock monitoring service for Bursa Stock Tracker.
 Handles stock price fetching, threshold checking, and alert triggering.
 """
+import csv
+import numpy as np
 import yfinance as yf
-import pandas as pd
-import json
-from typing import Dict, List
-from datetime import datetime, timedelta
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime
 from pathlib import Path
 
 from app.core.config import config
 from app.core.logger import setup_logger
-from app.utils.helpers import validate_stock_symbol, validate_threshold, rotate_csv_file, format_price
+from app.utils.helpers import TIMESTAMP_FORMAT, json_dumps, json_loads, rotate_csv_file, format_price
 from app.services.notifications import send_notifications
 
 logger = setup_logger()
@@ -26,35 +30,132 @@ ALERT_FILE = DATA_DIR / 'last_alerts.json'
 
 # Initialize files
 if not CSV_FILE.exists():
-    df = pd.DataFrame(columns=['Timestamp', 'Stock', 'Price'])
-    df.to_csv(CSV_FILE, index=False)
+    with open(CSV_FILE, 'w', newline='') as f:
+        csv.writer(f, lineterminator='\n').writerow(['Timestamp', 'Stock', 'Price'])
     logger.info(f"Created new CSV file: {CSV_FILE}")
 
 if not ALERT_FILE.exists():
-    with open(ALERT_FILE, 'w') as f:
-        json.dump({}, f)
+    with open(ALERT_FILE, 'wb') as f:
+        f.write(json_dumps({}))
     logger.info(f"Created new alert tracking file: {ALERT_FILE}")
 
+# Latest prices published by check_stocks for API readers: symbol -> (price, fetched at epoch seconds)
+_LAST_PRICES: Dict[str, Tuple[float, float]] = {}
+_prices_lock = threading.Lock()
+
+# Bounded pool for per-symbol fallback fetches (I/O bound)
+_EXECUTOR = ThreadPoolExecutor(max_workers=min(32, max(1, len(config.thresholds))))
+
+# Ticker objects reused across calls, keyed by symbol
+_TICKERS: Dict[str, yf.Ticker] = {}
+
+# Size of history.csv in bytes, tracked in-process to avoid a stat per cycle
+_csv_size: Optional[int] = None
+
+# Alert cooldown in seconds (monitor settings are fixed for the process lifetime)
+_COOLDOWN_SECONDS = config.monitor['alert_cooldown_hours'] * 3600
+
+# Last alert times, loaded once and written back when they change
+_last_alerts: Dict[str, Dict[str, int]] = {}
+_alerts_lock = threading.Lock()
+
+# Validated thresholds as parallel arrays: (symbols, ups, downs)
+_THRESHOLD_ARRAYS: Tuple[List[str], np.ndarray, np.ndarray] = ([], np.array([]), np.array([]))
+
+
+def refresh_threshold_arrays() -> None:
+    """
+    Rebuild the threshold arrays used by check_stocks from config.thresholds_flat.
+    
+    Must be called after config.refresh_thresholds_flat(), which has
+    already dropped invalid entries. Also registers a cached Ticker for
+    every monitored symbol.
+    """
+    global _THRESHOLD_ARRAYS
+    flat = config.thresholds_flat
+    _THRESHOLD_ARRAYS = (
+        [stock for stock, _, _ in flat],
+        np.array([up for _, up, _ in flat]),
+        np.array([down for _, _, down in flat])
+    )
+    
+    # Create Ticker objects for newly monitored symbols up front
+    for stock, _, _ in flat:
+        if stock not in _TICKERS:
+            _TICKERS[stock] = yf.Ticker(stock)
+
+
+refresh_threshold_arrays()
+
 
 def load_last_alerts() -> Dict:
-    """Load last alert timestamps from file."""
+    """
+    Load last alert timestamps from file.
+    
+    Timestamps are stored as Unix epoch seconds. Entries written by older
+    versions as formatted date strings are converted on load.
+    """
     try:
-        with open(ALERT_FILE, 'r') as f:
-            return json.load(f)
+        with open(ALERT_FILE, 'rb') as f:
+            data = json_loads(f.read())
+        if not isinstance(data, dict):
+            raise ValueError("expected an object mapping stocks to alert times")
+        
+        for stock, alerts in list(data.items()):
+            if not isinstance(alerts, dict):
+                logger.warning(f"Invalid alert entry for {stock}: {alerts!r}")
+                del data[stock]
+                continue
+            for alert_type, value in list(alerts.items()):
+                if isinstance(value, str):
+                    try:
+                        alerts[alert_type] = int(datetime.strptime(value, TIMESTAMP_FORMAT).timestamp())
+                    except ValueError as e:
+                        logger.warning(f"Invalid timestamp format for {stock}: {e}")
+                        del alerts[alert_type]
+                elif isinstance(value, bool) or not isinstance(value, (int, float)):
+                    logger.warning(f"Invalid timestamp value for {stock}: {value!r}")
+                    del alerts[alert_type]
+        return data
     except Exception as e:
         logger.error(f"Error loading alerts file: {e}")
         return {}
 
 
 def save_last_alerts(data: Dict) -> None:
-    """Save last alert timestamps to file."""
+    """Save last alert timestamps to file (atomically, via a temporary file)."""
+    tmp_file = ALERT_FILE.with_name(ALERT_FILE.name + '.tmp')
     try:
-        with open(ALERT_FILE, 'w') as f:
-            json.dump(data, f, indent=2)
+        with open(tmp_file, 'wb') as f:
+            f.write(json_dumps(data, indent=True))
+            # Make the new contents durable before they replace the old file
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, ALERT_FILE)
     except Exception as e:
         logger.error(f"Error saving alerts file: {e}")
 
 
+def get_last_alerts() -> Dict:
+    """
+    Get last alert timestamps from memory.
+    
+    Returns:
+        Copy of the last alert times per stock, formatted as date strings
+    """
+    with _alerts_lock:
+        return {
+            stock: {
+                alert_type: datetime.fromtimestamp(sent_at).strftime(TIMESTAMP_FORMAT)
+                for alert_type, sent_at in alerts.items()
+            }
+            for stock, alerts in _last_alerts.items()
+        }
+
+
+_last_alerts.update(load_last_alerts())
+
+
 def should_send_alert(stock: str, alert_type: str, last_alerts: Dict) -> bool:
     """
     Check if alert should be sent based on cooldown period.
@@ -62,27 +163,30 @@ def should_send_alert(stock: str, alert_type: str, last_alerts: Dict) -> bool:
     Args:
         stock: Stock symbol
         alert_type: Alert type (UP or DOWN)
-        last_alerts: Dictionary of last alert times
+        last_alerts: Dictionary of last alert times (epoch seconds)
     
     Returns:
         True if alert should be sent, False otherwise
     """
-    last_time_str = last_alerts.get(stock, {}).get(alert_type)
-    if not last_time_str:
+    last_time = last_alerts.get(stock, {}).get(alert_type)
+    if last_time is None:
         return True
     
-    try:
-        last_time = datetime.strptime(last_time_str, '%Y-%m-%d %H:%M:%S')
-        cooldown_hours = config.monitor['alert_cooldown_hours']
-        if datetime.now() - last_time < timedelta(hours=cooldown_hours):
-            logger.debug(f"Alert for {stock} {alert_type} skipped (cooldown period)")
-            return False
-    except ValueError as e:
-        logger.warning(f"Invalid timestamp format for {stock}: {e}")
+    if time.time() - last_time < _COOLDOWN_SECONDS:
+        logger.debug(f"Alert for {stock} {alert_type} skipped (cooldown period)")
+        return False
     
     return True
 
 
+def _get_ticker(stock: str) -> yf.Ticker:
+    """Return the cached Ticker for a symbol, creating it on first use."""
+    ticker = _TICKERS.get(stock)
+    if ticker is None:
+        ticker = _TICKERS.setdefault(stock, yf.Ticker(stock))
+    return ticker
+
+
 def get_stock_price(stock: str) -> float:
     """
     Fetch current stock price from Yahoo Finance.
@@ -96,30 +200,120 @@ def get_stock_price(stock: str) -> float:
     Raises:
         Exception: If unable to fetch price
     """
-    ticker = yf.Ticker(stock)
-    history = ticker.history(period="1d")
-    if history.empty:
+    history = _get_ticker(stock).history(period="1d")
+    # An empty frame may lack the Close column; a trailing row can be NaN
+    closes = history['Close'].dropna() if not history.empty else history
+    if closes.empty:
         raise ValueError(f"No data available for {stock}")
-    return history['Close'].iloc[-1]
+    return float(closes.iloc[-1])
 
 
-def get_all_stock_prices() -> Dict[str, float]:
+def get_prices_batch(symbols: List[str]) -> Dict[str, float]:
     """
-    Fetch current prices for all monitored stocks.
+    Fetch current prices for many stocks with a single Yahoo Finance request.
+    
+    Args:
+        symbols: Stock symbols to fetch
     
     Returns:
-        Dictionary mapping stock symbols to current prices
+        Dictionary mapping stock symbols to current prices. Symbols without
+        data are omitted.
     """
+    if not symbols:
+        return {}
+    
     prices = {}
-    for stock in config.thresholds.keys():
+    try:
+        data = yf.download(
+            tickers=symbols,
+            period="1d",
+            interval="1d",
+            group_by='ticker',
+            auto_adjust=True,
+            threads=True,
+            progress=False
+        )
+    except Exception as e:
+        # Yahoo Finance is unreachable or rate limiting; per-symbol retries would only pile on
+        logger.error(f"Failed to fetch batch prices: {e}")
+        return prices
+    
+    # A blocked or failed request usually comes back as an empty frame, not an exception
+    if data.empty:
+        logger.error("Failed to fetch batch prices: no data returned")
+        return prices
+    
+    errors = {}
+    multi_ticker = data.columns.nlevels > 1
+    for stock in symbols:
         try:
-            if validate_stock_symbol(stock):
-                prices[stock] = get_stock_price(stock)
+            history = data[stock] if multi_ticker else data
+            # Rows are aligned across tickers, so a symbol's last row can be NaN
+            closes = history['Close'].dropna()
+            if closes.empty:
+                raise ValueError(f"No data available for {stock}")
+            prices[stock] = float(closes.iloc[-1])
         except Exception as e:
-            logger.error(f"Failed to fetch {stock} price: {e}")
+            errors[stock] = e
+    
+    # No usable Close for any symbol means the batch failed as a whole
+    if not prices:
+        logger.error("Failed to fetch batch prices: no close prices in the response")
+        return prices
+    
+    for stock, e in errors.items():
+        logger.warning(f"{stock} missing from batch download: {e}")
+    
+    # Retry symbols missing from the batch result, one request each in parallel
+    missing = [stock for stock in symbols if stock not in prices]
+    if missing:
+        futures = {_EXECUTOR.submit(get_stock_price, stock): stock for stock in missing}
+        for future in as_completed(futures):
+            stock = futures[future]
+            try:
+                prices[stock] = float(future.result())
+            except Exception as e:
+                logger.error(f"Failed to fetch {stock} price: {e}")
     return prices
 
 
+def get_all_stock_prices() -> Dict[str, Tuple[float, str]]:
+    """
+    Get the latest prices for all monitored stocks.
+    
+    Prices come from the monitoring cycles; no request is made to Yahoo
+    Finance. A stock missing from a cycle's fetch keeps its previous price,
+    so each price carries the time it was fetched.
+    
+    Returns:
+        Dictionary mapping stock symbols to (price, fetch time as a date string)
+    """
+    with _prices_lock:
+        snapshot = dict(_LAST_PRICES)
+    return {
+        stock: (price, datetime.fromtimestamp(fetched_at).strftime(TIMESTAMP_FORMAT))
+        for stock, (price, fetched_at) in snapshot.items()
+    }
+
+
+def get_last_price(stock: str) -> Optional[Tuple[float, str]]:
+    """
+    Get the latest price for one stock from the monitoring cycles.
+    
+    Args:
+        stock: Stock symbol
+    
+    Returns:
+        (price, fetch time as a date string), or None if the stock has no price yet
+    """
+    with _prices_lock:
+        entry = _LAST_PRICES.get(stock)
+    if entry is None:
+        return None
+    price, fetched_at = entry
+    return price, datetime.fromtimestamp(fetched_at).strftime(TIMESTAMP_FORMAT)
+
+
 def get_price_history(limit: int = 100) -> List[Dict]:
     """
     Get price history from CSV file.
@@ -131,75 +325,139 @@ def get_price_history(limit: int = 100) -> List[Dict]:
         List of price history records
     """
     try:
-        if CSV_FILE.exists():
-            df = pd.read_csv(CSV_FILE)
-            # Get last N records
-            df = df.tail(limit)
-            return df.to_dict('records')
-        return []
+        if not CSV_FILE.exists() or limit <= 0:
+            return []
+        
+        # Read only the tail of the file instead of loading it whole
+        size = CSV_FILE.stat().st_size
+        approx = min(size, limit * 128 + 256)
+        with open(CSV_FILE, 'rb') as f:
+            f.seek(size - approx)
+            lines = f.read().splitlines()
+        if approx < size:
+            # First line is likely cut mid-row
+            lines = lines[1:]
+        
+        # Parse all rows with one reader; skip the header and malformed rows
+        records = []
+        for row in csv.reader(line.decode('utf-8') for line in lines[-limit:]):
+            if len(row) != 3 or row[0] == 'Timestamp':
+                continue
+            timestamp, stock, price = row
+            try:
+                price = float(price)
+            except ValueError:
+                # Torn or corrupt row (e.g. an interrupted write)
+                continue
+            records.append({'Timestamp': timestamp, 'Stock': stock, 'Price': price})
+        return records
     except Exception as e:
         logger.error(f"Error reading price history: {e}")
         return []
 
 
+def _get_csv_size() -> int:
+    """Return the size of history.csv in bytes, or 0 if it does not exist."""
+    try:
+        return os.path.getsize(CSV_FILE)
+    except OSError:
+        return 0
+
+
 def check_stocks() -> None:
     """
     Check stock prices and send alerts if thresholds are breached.
     """
+    global _csv_size
+    
     logger.info("Starting stock price check...")
     
-    # Rotate CSV if needed
-    rotate_csv_file(CSV_FILE, config.monitor['max_csv_size_mb'])
+    # Rotate CSV if needed (only stat the file again when close to the limit)
+    if _csv_size is None:
+        _csv_size = _get_csv_size()
+    if _csv_size >= config.monitor['max_csv_size_mb'] * 1024 * 1024 * 0.9:
+        # A failed rotation must not stop this cycle's fetch and threshold check
+        try:
+            rotate_csv_file(CSV_FILE, config.monitor['max_csv_size_mb'])
+        except OSError as e:
+            logger.error(f"Error rotating price history: {e}")
+        _csv_size = _get_csv_size()
     
-    last_alerts = load_last_alerts()
+    last_alerts = _last_alerts
     triggered_alerts = []
+    dirty = False
 
-    for stock, limits in config.thresholds.items():
-        # Validate stock symbol
-        if not validate_stock_symbol(stock):
-            logger.warning(f"Invalid stock symbol: {stock}")
-            continue
-        
-        # Validate threshold
-        if not validate_threshold(limits):
-            logger.warning(f"Invalid threshold for {stock}: {limits}")
-            continue
-        
+    symbols, ups, downs = _THRESHOLD_ARRAYS
+
+    # Fetch all prices in one batch request
+    prices = get_prices_batch(symbols)
+
+    now = time.time()
+
+    # Publish prices for the API per symbol: stocks missing from this fetch keep
+    # their previous price and fetch time; stocks no longer monitored are dropped
+    monitored = set(symbols)
+    with _prices_lock:
+        for stock in [stock for stock in _LAST_PRICES if stock not in monitored]:
+            del _LAST_PRICES[stock]
+        _LAST_PRICES.update((stock, (price, now)) for stock, price in prices.items())
+    timestamp = datetime.fromtimestamp(now).strftime(TIMESTAMP_FORMAT)
+
+    rows = []
+    for stock, price in prices.items():
+        logger.info(f"{stock} price: {format_price(price)}")
+        rows.append((timestamp, stock, f"{price:.4f}"))
+
+    # Append all rows in a single write (a failed write must not block alerts)
+    if rows:
         try:
-            price = get_stock_price(stock)
-            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            logger.info(f"{stock} price: {format_price(price)}")
-
-            # Save to CSV
-            df = pd.DataFrame([[timestamp, stock, price]], columns=['Timestamp', 'Stock', 'Price'])
-            df.to_csv(CSV_FILE, mode='a', header=False, index=False)
-
-            # Determine alert type
-            alert_type = None
-            threshold_value = None
-            if price >= limits['up']:
-                alert_type = "UP"
-                threshold_value = limits['up']
-            elif price <= limits['down']:
-                alert_type = "DOWN"
-                threshold_value = limits['down']
-
-            # Check if alert should be sent
-            if alert_type and should_send_alert(stock, alert_type, last_alerts):
-                triggered_alerts.append({
-                    'stock': stock,
-                    'price': price,
-                    'alert_type': alert_type,
-                    'threshold': threshold_value
-                })
-                last_alerts.setdefault(stock, {})[alert_type] = timestamp
-                logger.info(f"Alert triggered for {stock}: {alert_type} at {format_price(price)}")
+            with open(CSV_FILE, 'a', buffering=1 << 16, newline='') as fh:
+                writer = csv.writer(fh, lineterminator='\n')
+                if fh.tell() == 0:
+                    # File was just rotated away; restore the header
+                    writer.writerow(['Timestamp', 'Stock', 'Price'])
+                writer.writerows(rows)
+                # One flush + fsync per cycle covers every row written above
+                fh.flush()
+                os.fsync(fh.fileno())
+                _csv_size = fh.tell()
+        except OSError as e:
+            logger.error(f"Error writing price history: {e}")
 
-        except Exception as e:
-            logger.error(f"Failed to fetch {stock} price: {e}")
+    # Compare all prices against thresholds at once (missing prices are NaN and never hit)
+    price_array = np.array([prices.get(stock, np.nan) for stock in symbols])
+    up_hit = price_array >= ups
+    down_hit = ~up_hit & (price_array <= downs)
+
+    for idx in np.flatnonzero(up_hit | down_hit):
+        stock = symbols[idx]
+        price = prices[stock]
+        if up_hit[idx]:
+            alert_type = "UP"
+            threshold_value = float(ups[idx])
+        else:
+            alert_type = "DOWN"
+            threshold_value = float(downs[idx])
+
+        # Check if alert should be sent
+        if should_send_alert(stock, alert_type, last_alerts):
+            triggered_alerts.append({
+                'stock': stock,
+                'price': price,
+                'alert_type': alert_type,
+                'threshold': threshold_value
+            })
+            with _alerts_lock:
+                last_alerts.setdefault(stock, {})[alert_type] = int(now)
+            dirty = True
+            logger.info(f"Alert triggered for {stock}: {alert_type} at {format_price(price)}")
 
-    # Save updated last alerts
-    save_last_alerts(last_alerts)
+    # Save updated last alerts (only when an alert fired)
+    if dirty:
+        # Copy under the lock, write outside it so API readers are not blocked on disk I/O
+        with _alerts_lock:
+            snapshot = {stock: dict(alerts) for stock, alerts in last_alerts.items()}
+        save_last_alerts(snapshot)
 
     # Send notifications if there are triggered alerts
     if triggered_alerts:
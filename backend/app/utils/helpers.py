@@ -1,13 +1,64 @@
 """
 Utility functions for Bursa Stock Tracker.
 """
+import gzip
+import json
 import os
 import re
-from typing import List, Optional
+import shutil
+from functools import lru_cache
+from typing import Any, List, Optional
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+# Timestamp format used for history rows, alert times and notifications
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Precompiled patterns
+_SYMBOL_RE = re.compile(r'^\d{4}\.KL$')
+_SANITIZE_RE = re.compile(r'[^\w\s\-\.]')
+
+
+def json_loads(data: bytes) -> Any:
+    """
+    Parse JSON, using orjson when it is installed.
+    
+    Args:
+        data: JSON document as bytes
+    
+    Returns:
+        Parsed object
+    
+    Raises:
+        json.JSONDecodeError: If the document is invalid
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Serialize an object to JSON bytes, using orjson when it is installed.
+    
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2-space indentation
+    
+    Returns:
+        JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else None)
+    return json.dumps(obj, indent=2 if indent else None).encode('utf-8')
+
+
+@lru_cache(maxsize=4096)
 def validate_stock_symbol(symbol: str) -> bool:
     """
     Validate Malaysian stock symbol format (e.g., 5285.KL).
@@ -18,8 +69,7 @@ def validate_stock_symbol(symbol: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    pattern = r'^\d{4}\.KL$'
-    return bool(re.match(pattern, symbol))
+    return _SYMBOL_RE.match(symbol) is not None
 
 
 def validate_threshold(threshold: dict) -> bool:
@@ -64,7 +114,9 @@ def get_file_size_mb(filepath: Path) -> float:
 def rotate_csv_file(filepath: Path, max_size_mb: int = 10) -> None:
     """
     Rotate CSV file if it exceeds max size.
-    Creates a backup with timestamp and starts fresh file.
+    Compresses the file into a gzip backup with timestamp and starts fresh file.
+    If compression fails (e.g. the disk is full), the file is renamed to an
+    uncompressed backup instead.
     
     Args:
         filepath: Path to CSV file
@@ -73,10 +125,22 @@ def rotate_csv_file(filepath: Path, max_size_mb: int = 10) -> None:
     if get_file_size_mb(filepath) > max_size_mb:
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         backup_path = filepath.parent / f'{filepath.stem}_backup_{timestamp}{filepath.suffix}'
+        gz_path = backup_path.with_name(backup_path.name + '.gz')
+        tmp_path = gz_path.with_name(gz_path.name + '.tmp')
         
         if filepath.exists():
-            filepath.rename(backup_path)
-            print(f"CSV file rotated: {backup_path}")
+            try:
+                # Compress under a temporary name so a failure leaves no partial backup
+                with open(filepath, 'rb') as src, gzip.open(tmp_path, 'wb', compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst)
+                os.replace(tmp_path, gz_path)
+            except OSError as e:
+                tmp_path.unlink(missing_ok=True)
+                filepath.rename(backup_path)
+                print(f"CSV compression failed ({e}); rotated uncompressed: {backup_path}")
+                return
+            filepath.unlink()
+            print(f"CSV file rotated: {gz_path}")
 
 
 def format_price(price: float) -> str:
@@ -103,4 +167,4 @@ def sanitize_input(text: str) -> str:
         Sanitized text
     """
     # Remove potentially dangerous characters
-    return re.sub(r'[^\w\s\-\.]', '', text)
+    return _SANITIZE_RE.sub('', text)
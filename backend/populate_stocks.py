@@ -38,19 +38,17 @@ def hot_load_stocks():
     
     print("Hot-loading stocks into running backend...")
     
-    for symbol, thresholds in NEW_STOCKS.items():
-        try:
-            response = requests.put(
-                f"{base_url}/{symbol}",
-                json=thresholds
-            )
-            response.raise_for_status()
+    try:
+        with requests.Session() as session:
+            response = session.put(base_url, json=NEW_STOCKS)
+        response.raise_for_status()
+        for symbol in NEW_STOCKS:
             print(f"  [+] Added {symbol}")
-        except requests.exceptions.ConnectionError:
-            print(f"  [-] Failed to connect to backend. Is it running?")
-            return False
-        except Exception as e:
-            print(f"  [-] Failed to add {symbol}: {e}")
+    except requests.exceptions.ConnectionError:
+        print(f"  [-] Failed to connect to backend. Is it running?")
+        return False
+    except Exception as e:
+        print(f"  [-] Failed to add stocks: {e}")
     
     print("Done hot-loading.")
     return True
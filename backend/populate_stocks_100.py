@@ -60,26 +60,18 @@ def hot_load_stocks():
     
     print(f"Hot-loading {len(FORMATTED_STOCKS)} stocks into running backend...")
     
-    count = 0
-    for symbol, thresholds in FORMATTED_STOCKS.items():
-        try:
-            # We don't want to spam requests too fast, backend might choke?
-            # It's local, should be fast. But let's verify.
-            response = requests.put(
-                f"{base_url}/{symbol}",
-                json=thresholds
-            )
-            if response.status_code == 200:
-                print(f"  [+] Added {symbol}")
-                count += 1
-            else:
-                print(f"  [-] Failed {symbol}: {response.status_code}")
-        except requests.exceptions.ConnectionError:
-            print(f"  [-] Connection error for {symbol}")
-        except Exception as e:
-            print(f"  [-] Error {symbol}: {e}")
-            
-    print(f"Done. Successfully loaded {count} stocks.")
+    try:
+        with requests.Session() as session:
+            response = session.put(base_url, json=FORMATTED_STOCKS)
+        if response.status_code == 200:
+            count = response.json().get("updated", 0)
+            print(f"Done. Successfully loaded {count} stocks.")
+        else:
+            print(f"  [-] Failed: {response.status_code} {response.text}")
+    except requests.exceptions.ConnectionError:
+        print("  [-] Failed to connect to backend. Is it running?")
+    except Exception as e:
+        print(f"  [-] Error: {e}")
 
 if __name__ == "__main__":
     update_file()